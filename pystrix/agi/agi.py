@@ -49,8 +49,8 @@ class AGI(_AGI):
         `debug` should only be turned on for library development.
         """
         signal.signal(signal.SIGHUP, self._handle_sighup)
-        self._rfile = sys.stdin
-        self._wfile = sys.stdout
+        self._rfile = sys.stdin.buffer
+        self._wfile = sys.stdout.buffer
         
         _AGI.__init__(self, debug)
         
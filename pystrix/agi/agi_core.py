@@ -38,15 +38,14 @@ import collections
 import re
 import time
 
-import sys
-
 _Response = collections.namedtuple('Response', ('items', 'code', 'raw'))
 _ValueData = collections.namedtuple('ValueData', ('value', 'data'))
 
-_RE_CODE = re.compile(r'(^\d+)\s*(.+)') #Matches Asterisk's response-code lines
+_RE_CODE = re.compile(r'(\d+)\s*(.+)') #Matches Asterisk's response-code lines, anchored by match()
 _RE_KV = re.compile(r'(?P<key>\w+)=(?P<value>[^\s]+)?(?:\s+\((?P<data>.*)\))?') #Matches Asterisk's key-value response-pairs
 
 _RESULT_KEY = 'result'
+_RESULT_PREFIX = _RESULT_KEY + '=' #Begins the 'raw' string of a response that may carry nothing but the result
 
 
 #Functions
@@ -56,9 +55,7 @@ def quote(value):
     Encapsulates `value` in double-quotes and coerces it into a string, if
     necessary.
     """
-    return '"%(value)s"' % {
-     'value': str(value),
-    }
+    return '"%s"' % (value,)
 
 
 #Classes
@@ -71,8 +68,8 @@ class _AGI(object):
     """
     _environment = None #The environment variables received from Asterisk for this channel
     _debug = False #If True, development information is printed to console
-    _rfile = None #The input file-like-object
-    _wfile = None #The output file-like-object
+    _rfile = None #The input file-like-object, in binary mode
+    _wfile = None #The output file-like-object, in binary mode
     
     def __init__(self, debug=False):
         """
@@ -136,24 +133,30 @@ class _AGI(object):
         `AGIUnknownError` covers any unrecognised Asterisk response code.
         """
         code = 0
+        raw = None #The entire line, excluding the code
         response = {}
         
         line = self._read_line()
-        m = _RE_CODE.search(line)
-        if m:
-            code = int(m.group(1))
-            
+        if line[3:4] == ' ' and line[:3].isdecimal(): #The standard form, which needs no regex
+            code = int(line[:3])
+            raw = line[4:].lstrip()
+        else:
+            m = _RE_CODE.match(line)
+            if m:
+                code = int(m.group(1))
+                raw = m.group(2)
+                
         if code == 200:
-            raw = m.group(2) #The entire line, excluding the code
-            for (key, value, data) in _RE_KV.findall(m.group(2)):
-                response[key] = _ValueData(value or '', data)
+            if raw.startswith(_RESULT_PREFIX) and ' ' not in raw and '\t' not in raw: #A lone result, as most actions receive
+                response[_RESULT_KEY] = _ValueData(raw[len(_RESULT_PREFIX):], '')
+            else:
+                for (key, value, data) in _RE_KV.findall(raw):
+                    response[key] = _ValueData(value or '', data)
                 
-            if not _RESULT_KEY in response: #Must always be present.
-                raise AGINoResultError("Asterisk did not provide a '%(result-key)s' key-value pair" % {
-                 'result-key': _RESULT_KEY,
-                }, response)
-
             result = response.get(_RESULT_KEY)
+            if result is None: #Must always be present.
+                raise AGINoResultError("Asterisk did not provide a '%s' key-value pair" % (_RESULT_KEY,), response)
+
             if check_hangup and result.data == 'hangup': #A 'hangup' response usually indicates that the channel was hungup, but it is a legal variable value
                 raise AGIResultHangup("User hung up during execution", response)
                 
@@ -169,17 +172,13 @@ class _AGI(object):
             raise AGIDeadChannelError(response)
         elif code == 520:
             usage = [line]
-            while True:
+            while not line.startswith('520 '): #'520-' opens a multi-line usage message; '520 ' ends it, or is the whole message
                 line = self._read_line()
                 usage.append(line)
-                if '520 End of proper usage.' in line:
-                    break
-            raise AGIUsageError('\n'.join(usage + ['']))
+            usage.append('')
+            raise AGIUsageError('\n'.join(usage))
         else:
-            raise AGIUnknownError("Unhandled code or undefined response: %(code)i : %(line)s" % {
-             'code': code,
-             'line': repr(line),
-            })
+            raise AGIUnknownError("Unhandled code or undefined response: %i : %r" % (code, line))
             
     def _parse_agi_environment(self):
         """
@@ -190,12 +189,11 @@ class _AGI(object):
             if line == '': #Blank line signals end
                 break
                 
-            if ':' in line:
-                (key, data) = line.split(':', 1)
-                key = key.strip()
-                data = data.strip()
+            (key, separator, data) = line.partition(':')
+            if separator:
+                key = key.rstrip() #The line's outer whitespace was stripped when it was read
                 if key:
-                    self._environment[key] = data
+                    self._environment[key] = data.lstrip()
                     
     def _read_line(self, should_strip=True):
         """
@@ -205,29 +203,33 @@ class _AGI(object):
         If the pipe is closed before this happens, `AGISIGPIPEHangup` is raised.
         """
         try:
-            line = self._rfile.readline()
-            try:
-                line = line.decode()  # decode line if it comes in bytes, example if it comes from a socket
-            except:
-                pass  # line it's a string, so nothing to change - it's string if it's using stdin as _rfile for example
-            # Check to see if we received a HANGUP because AGISIGHUP was not set explicitly or is no
-            # and then handle the HANGUP which is being returned because the AGI script can still interact with
-            # Asterisk after the call was hungup in DeadAGI mode (which Asterisk converts the channel to automatically)
-            # All commands won't work in DeadAGI but that is not our concern here because if such a command is issued
-            # which indeed requires channel interaction, Asterisk will respond with a 511 code.
-            if 'no' == self._environment.get('AGISIGHUP', 'no') and 'HANGUP\n' == line:
-                line = self._read_line(should_strip=False) # read from pipe again to get response for the given command
-            if not line: #EOF encountered
-                raise AGISIGPIPEHangup("Process input pipe closed")
-            elif not line.endswith('\n'): #Fragment encountered
-                #Recursively append to the current fragment until the line is
-                #complete or the socket dies.
-                line += self._read_line()
+            while True:
+                line = self._rfile.readline()
+                if not line: #EOF encountered
+                    raise AGISIGPIPEHangup("Process input pipe closed")
+                elif not line.endswith(b'\n'): #Fragment encountered
+                    #Collect fragments until the line is complete or the socket dies, joining them once.
+                    fragments = [line]
+                    while True:
+                        fragment = self._rfile.readline()
+                        if not fragment:
+                            raise AGISIGPIPEHangup("Process input pipe closed")
+                        fragments.append(fragment)
+                        if fragment.endswith(b'\n'):
+                            break
+                    line = b''.join(fragments)
+                line = line.decode('utf-8', 'surrogateescape') #Transcoded once, after the line is complete; undecodable bytes survive as surrogates
+                # Check to see if we received a HANGUP because AGISIGHUP was not set explicitly or is no
+                # and then handle the HANGUP which is being returned because the AGI script can still interact with
+                # Asterisk after the call was hungup in DeadAGI mode (which Asterisk converts the channel to automatically)
+                # All commands won't work in DeadAGI but that is not our concern here because if such a command is issued
+                # which indeed requires channel interaction, Asterisk will respond with a 511 code.
+                # If so, read from the pipe again to get the response for the given command.
+                if not ('HANGUP\n' == line and 'no' == self._environment.get('AGISIGHUP', 'no')):
+                    break
             return line.strip() if should_strip else line
         except IOError as e:
-            raise AGISIGPIPEHangup("Process input pipe broken: %(error)s" % {
-             'error': str(e),
-            })
+            raise AGISIGPIPEHangup("Process input pipe broken: %s" % (e,))
             
     def _send_command(self, command, *args):
         """
@@ -238,15 +240,12 @@ class _AGI(object):
 
         If the connection to Asterisk is broken, `AGISIGPIPEHangup` is raised.
         """
+        command = command.encode('utf-8', 'surrogateescape') #Restores any bytes that were undecodable when read
         try:
-            if self._wfile is not sys.stdout:  # stdout handles str instead of bytes, so we don't encode
-                command = command.encode()
             self._wfile.write(command)
             self._wfile.flush()
         except Exception as e:
-            raise AGISIGPIPEHangup("Socket link broken: %(error)s" % {
-             'error': str(e),
-            })
+            raise AGISIGPIPEHangup("Socket link broken: %s" % (e,))
             
     def _test_hangup(self):
         """
@@ -262,7 +261,7 @@ class _Action(object):
     Provides the basis for assembling and issuing an action via AGI.
     """
     _command = None #The command that drives this action
-    _arguments = None #A tuple of arguments to qualify the command
+    _arguments = None #A tuple of strings (or None, to be omitted) that qualify the command
     check_hangup = True #True if the output of this action is sure to be hangup-detection-safe
     
     def __init__(self, command, *arguments):
@@ -271,10 +270,11 @@ class _Action(object):
 
     @property
     def command(self):
-        command = ' '.join([self._command.strip()] + [str(arg) for arg in self._arguments if not arg is None]).strip()
-        if not command.endswith('\n'):
-            command += '\n'
-        return command
+        if not self._arguments: #ANSWER, NOOP, and the like
+            return self._command + '\n'
+        if None in self._arguments: #Optional arguments were omitted
+            return ' '.join([self._command] + [arg for arg in self._arguments if arg is not None]) + '\n'
+        return ' '.join((self._command,) + self._arguments) + '\n'
         
     def process_response(self, response):
         """
@@ -293,8 +293,8 @@ class AGIException(Exception):
     items = None #Any items received from Asterisk, as a dictionary.
 
     def __init__(self, message, items=None):
-        Exception.__init__(self, message)
-        self.items = items if items else {}
+        super().__init__(message)
+        self.items = items if items is not None else {}
         
 class AGIError(AGIException):
     """
@@ -31,6 +31,7 @@ Authors:
 
 - Neil Tallim <n.tallim@ivrnet.com>
 """
+import functools
 import time
 
 from pystrix.agi.agi_core import (
@@ -68,6 +69,13 @@ TDD_ON = 'on'
 TDD_OFF = 'off'
 TDD_MATE = 'mate'
 
+#Arguments that never vary, quoted once at import
+_MUSIC_ON = quote('on')
+_MUSIC_OFF = quote('off')
+_RECORD_BEEP = quote('beep')
+_EMPTY_QUOTED = quote('') #The usual escape-digit list
+_LOG_LEVELS = dict((level, quote(level)) for level in (LOG_DEBUG, LOG_INFO, LOG_WARN, LOG_ERROR, LOG_CRITICAL))
+
 
 # Functions
 ###############################################################################
@@ -78,10 +86,8 @@ def _convert_to_char(value, items):
     """
     try:
         return chr(int(value))
-    except ValueError:
-        raise AGIAppError("Unable to convert Asterisk result to DTMF character: %(value)r" % {
-            'value': value,
-        }, items)
+    except (ValueError, OverflowError):
+        raise AGIAppError("Unable to convert Asterisk result to DTMF character: %r" % (value,), items)
 
 
 def _convert_to_int(items):
@@ -90,19 +96,43 @@ def _convert_to_int(items):
     can't be parsed.
     """
     offset = items.get('endpos')
-    if offset and offset.data.isdigit():
-        return int(offset.data)
-    else:
+    if offset is None:
+        return -1
+    try:
+        return int(offset.value)
+    except ValueError:
         return -1
 
 
 def _process_digit_list(digits):
     """
-    Ensures that digit-lists are processed uniformly.
+    Ensures that digit-lists are processed uniformly, returning them as an unquoted string.
+    """
+    if type(digits) is str: #By far the most common form, including the empty default
+        return digits
+    if isinstance(digits, (list, set)): #Unhashable, so reduce it to a form that can be cached
+        digits = tuple(digits)
+    return _join_digit_list(digits)
+
+
+def _quote_digit_list(digits):
+    """
+    Processes `digits` as a digit-list and returns it quoted, reusing a single quoted empty
+    string for the common case of no digits.
+    """
+    digits = _process_digit_list(digits)
+    return quote(digits) if digits else _EMPTY_QUOTED
+
+
+@functools.lru_cache(maxsize=256, typed=True)
+def _join_digit_list(digits):
+    """
+    Joins `digits`, which must be hashable, into a string; memoised because most dialplans reuse
+    a handful of escape-digit sets for every prompt.
     """
-    if type(digits) in (list, tuple, set, frozenset):
-        digits = ''.join([str(d) for d in digits])
-    return quote(digits)
+    if isinstance(digits, (tuple, frozenset)):
+        return ''.join(map(str, digits))
+    return str(digits)
 
 
 # Classes
@@ -148,7 +178,7 @@ class ChannelStatus(_Action):
     """
 
     def __init__(self, channel=None):
-        _Action.__init__(self, 'CHANNEL STATUS', (channel and quote(channel)) or None)
+        _Action.__init__(self, 'CHANNEL STATUS', quote(channel) if channel else None)
 
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
@@ -156,10 +186,9 @@ class ChannelStatus(_Action):
             return int(result.value)
         except ValueError:
             raise AGIAppError(
-                "'%(result-key)s' key-value pair received from Asterisk contained a non-numeric value: %(value)r" % {
-                    'result-key': _RESULT_KEY,
-                    'value': result.value,
-                }, response.items)
+                "'%s' key-value pair received from Asterisk contained a non-numeric value: %r" % (
+                    _RESULT_KEY, result.value,
+                ), response.items)
 
 
 class ControlStreamFile(_Action):
@@ -188,9 +217,8 @@ class ControlStreamFile(_Action):
     """
 
     def __init__(self, filename, escape_digits='', sample_offset=0, forward='', rewind='', pause=''):
-        escape_digits = _process_digit_list(escape_digits)
         _Action.__init__(self, 'CONTROL STREAM FILE', quote(filename),
-                         quote(escape_digits), quote(sample_offset),
+                         _quote_digit_list(escape_digits), quote(sample_offset),
                          quote(forward), quote(rewind), quote(pause)
                          )
 
@@ -219,10 +247,9 @@ class DatabaseDel(_Action):
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
         if result.value == '0':
-            raise AGIDBError("Unable to delete from database: family=%(family)r, key=%(key)r" % {
-                'family': self.family,
-                'key': self.key,
-            }, response.items)
+            raise AGIDBError("Unable to delete from database: family=%r, key=%r" % (
+                self.family, self.key,
+            ), response.items)
 
 
 class DatabaseDeltree(_Action):
@@ -237,7 +264,7 @@ class DatabaseDeltree(_Action):
 
     def __init__(self, family, keytree=None):
         _Action.__init__(self,
-                         'DATABASE DELTREE', quote(family), (keytree and quote(keytree) or None)
+                         'DATABASE DELTREE', quote(family), quote(keytree) if keytree else None
                          )
         self.family = family
         self.keytree = keytree
@@ -245,10 +272,9 @@ class DatabaseDeltree(_Action):
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
         if result.value == '0':
-            raise AGIDBError("Unable to delete family from database: family=%(family)r, keytree=%(keytree)r" % {
-                'family': self.family,
-                'keytree': self.keytree or '<unspecified>',
-            }, response.items)
+            raise AGIDBError("Unable to delete family from database: family=%r, keytree=%r" % (
+                self.family, self.keytree or '<unspecified>',
+            ), response.items)
 
 
 class DatabaseGet(_Action):
@@ -270,18 +296,15 @@ class DatabaseGet(_Action):
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
         if result.value == '0':
-            raise AGIDBError("Key not found in database: family=%(family)r, key=%(key)r" % {
-                'family': self.family,
-                'key': self.key,
-            }, response.items)
+            raise AGIDBError("Key not found in database: family=%r, key=%r" % (
+                self.family, self.key,
+            ), response.items)
         elif result.value == '1':
             return result.data
 
-        raise AGIDBError("Unable to query database: family=%(family)r, key=%(key)r, result=%(result)r" % {
-            'family': self.family,
-            'key': self.key,
-            'result': result.value,
-        }, response.items)
+        raise AGIDBError("Unable to query database: family=%r, key=%r, result=%r" % (
+            self.family, self.key, result.value,
+        ), response.items)
 
 
 class DatabasePut(_Action):
@@ -303,11 +326,9 @@ class DatabasePut(_Action):
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
         if result.value == '0':
-            raise AGIDBError("Unable to store value in database: family=%(family)r, key=%(key)r, value=%(value)r" % {
-                'family': self.family,
-                'key': self.key,
-                'value': self.value,
-            }, response.items)
+            raise AGIDBError("Unable to store value in database: family=%r, key=%r, value=%r" % (
+                self.family, self.key, self.value,
+            ), response.items)
 
 
 class Exec(_Action):
@@ -325,14 +346,12 @@ class Exec(_Action):
     def __init__(self, application, options=()):
         self._application = application
         options = ','.join((str(o or '') for o in options))
-        _Action.__init__(self, 'EXEC', self._application, (options and quote(options)) or '')
+        _Action.__init__(self, 'EXEC', str(application), quote(options) if options else None)
 
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
         if result.value == '-2':
-            raise AGIAppError("Unable to execute application '%(application)r'" % {
-                'application': self._application,
-            }, response.items)
+            raise AGIAppError("Unable to execute application '%r'" % (self._application,), response.items)
         return response.raw[7:]  # Everything after 'result='
 
 
@@ -413,10 +432,9 @@ class GetOption(_Action):
     """
 
     def __init__(self, filename, escape_digits='', timeout=2000):
-        escape_digits = _process_digit_list(escape_digits)
         _Action.__init__(self,
                          'GET OPTION', quote(filename),
-                         quote(escape_digits), quote(timeout)
+                         _quote_digit_list(escape_digits), quote(timeout)
                          )
 
     def process_response(self, response):
@@ -457,7 +475,7 @@ class Hangup(_Action):
     """
 
     def __init__(self, channel=None):
-        _Action.__init__(self, 'HANGUP', (channel and quote(channel) or None))
+        _Action.__init__(self, 'HANGUP', quote(channel) if channel else None)
 
 
 class Noop(_Action):
@@ -567,12 +585,11 @@ class RecordFile(_Action):
 
     def __init__(self, filename, format=FORMAT_WAV, escape_digits='', timeout=-1, sample_offset=0, beep=True,
                  silence=None):
-        escape_digits = _process_digit_list(escape_digits)
         _Action.__init__(self,
                          'RECORD FILE', quote(filename), quote(format),
-                         quote(escape_digits), quote(timeout), quote(sample_offset),
-                         (beep and quote('beep') or None),
-                         (silence and quote('s=' + str(silence)) or None)
+                         _quote_digit_list(escape_digits), quote(timeout), quote(sample_offset),
+                         _RECORD_BEEP if beep else None,
+                         quote('s=' + str(silence)) if silence else None
                          )
 
     def process_response(self, response):
@@ -580,10 +597,7 @@ class RecordFile(_Action):
         offset = _convert_to_int(response.items)
 
         if result.data == 'randomerror':
-            raise AGIAppError("Unknown error occurred %(ms)i into recording: %(error)s" % {
-                'ms': offset,
-                'error': result.value,
-            })
+            raise AGIAppError("Unknown error occurred %i into recording: %s" % (offset, result.value))
         elif result.data == 'timeout':
             return ('', offset, True)
         elif result.data == 'dtmf':
@@ -610,9 +624,8 @@ class _SayAction(_Action):
     """
 
     def __init__(self, say_type, argument, escape_digits, *args):
-        escape_digits = _process_digit_list(escape_digits)
         _Action.__init__(self,
-                         'SAY ' + say_type, quote(argument), quote(escape_digits), *args
+                         'SAY ' + say_type, quote(argument), _quote_digit_list(escape_digits), *args
                          )
 
     def process_response(self, response):
@@ -699,7 +712,7 @@ class SayDatetime(_SayAction):
             timezone = None
         _SayAction.__init__(self,
                             'DATETIME', seconds, escape_digits,
-                            (format and quote(format) or None), (timezone and quote(timezone) or None)
+                            quote(format) if format else None, quote(timezone) if timezone else None
                             )
 
 
@@ -820,15 +833,9 @@ class SetCallerid(_Action):
 
     def __init__(self, number, name=None):
         if name:  # Escape it
-            name = '\\"%(name)s\\"' % {
-                'name': name,
-            }
-        else:  # Make sure it's the empty string
-            name = ''
-        number = "%(name)s<%(number)s>" % {
-            'name': name,
-            'number': number,
-        }
+            number = '\\"%s\\"<%s>' % (name, number)
+        else:
+            number = '<%s>' % (number,)
         _Action.__init__(self, 'SET CALLERID', quote(number))
 
 
@@ -871,8 +878,8 @@ class SetMusic(_Action):
 
     def __init__(self, on, moh_class=None):
         _Action.__init__(self,
-                         'SET MUSIC', quote(on and 'on' or 'off'),
-                         (moh_class and quote(moh_class) or None)
+                         'SET MUSIC', _MUSIC_ON if on else _MUSIC_OFF,
+                         quote(moh_class) if moh_class else None
                          )
 
 
@@ -924,10 +931,9 @@ class StreamFile(_Action):
     """
 
     def __init__(self, filename, escape_digits='', sample_offset=0):
-        escape_digits = _process_digit_list(escape_digits)
         _Action.__init__(self,
                          'STREAM FILE', quote(filename),
-                         quote(escape_digits), quote(sample_offset)
+                         _quote_digit_list(escape_digits), quote(sample_offset)
                          )
 
     def process_response(self, response):
@@ -953,7 +959,7 @@ class TDDMode(_Action):
     """
 
     def __init__(self, mode):
-        _Action.__init__(self, 'TDD MODE', mode)
+        _Action.__init__(self, 'TDD MODE', str(mode))
 
     def process_response(self, response):
         result = response.items.get(_RESULT_KEY)
@@ -978,7 +984,7 @@ class Verbose(_Action):
     """
 
     def __init__(self, message, level=LOG_INFO):
-        _Action.__init__(self, 'VERBOSE', quote(message), quote(level))
+        _Action.__init__(self, 'VERBOSE', quote(message), _LOG_LEVELS.get(level) or quote(level))
 
 
 class WaitForDigit(_Action):
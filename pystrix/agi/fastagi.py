@@ -35,11 +35,14 @@ Authors:
 
 - Neil Tallim <n.tallim@ivrnet.com>
 """
-import cgi
+import concurrent.futures
+import io
 import platform
+import re
 import socket
 import subprocess
 import threading
+import urllib.parse
 from pystrix.agi.agi_core import *
 from pystrix.agi.agi_core import _AGI
 
@@ -52,8 +55,12 @@ except ModuleNotFoundError:
 class _ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     """
     Provides a variant of the TCPServer that spawns a new thread to handle each
-    request.
+    request, or hands it to a fixed-size pool of reusable worker threads if one
+    is set.
     """
+    _pool = None #A ThreadPoolExecutor to which requests are submitted; if None, a thread is spawned per request
+    _pool_slots = None #A BoundedSemaphore limiting the requests held by the pool; if None, there is no limit
+    allow_reuse_port = False #If True, other sockets may bind the same address and port, sharing its connections
 
     @staticmethod
     def get_somaxconn():
@@ -87,11 +94,66 @@ class _ThreadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
         self.allow_reuse_address = True
         super().__init__(*args, **kwargs)
 
+    def server_bind(self):
+        """
+        Sets SO_REUSEPORT on the listening socket before binding it, if `allow_reuse_port` is set
+        and the platform supports it.
+        """
+        if self.allow_reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def process_request(self, request, client_address):
+        """
+        Submits the request to the worker pool, if one is set, or spawns a new thread to
+        handle it. If the pool is full, the connection is closed immediately.
+        """
+        if self._pool is None:
+            socketserver.ThreadingMixIn.process_request(self, request, client_address)
+        elif self._pool_slots is not None and not self._pool_slots.acquire(blocking=False):
+            self.shutdown_request(request)
+        else:
+            self._pool.submit(self._process_pooled_request, request, client_address)
+
+    def _process_pooled_request(self, request, client_address):
+        """
+        Handles the request in a pool worker, then frees its slot in the pool.
+        """
+        try:
+            self.process_request_thread(request, client_address)
+        finally:
+            if self._pool_slots is not None:
+                self._pool_slots.release()
+
+    def server_close(self):
+        """
+        Closes the listening socket and stops the worker pool, if one is set, waiting for
+        in-progress requests to finish if `block_on_close` is set.
+        """
+        super().server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=self.block_on_close)
+
 
 class _AGIClientHandler(socketserver.StreamRequestHandler):
     """
     Handles TCP connections.
     """
+    disable_nagle_algorithm = True #Every command is a complete line, written at once, that blocks on a reply
+    keepalive_idle = 60 #Seconds of silence before TCP keepalive probes start, where the platform allows it to be set
+    
+    def setup(self):
+        """
+        Enables TCP keepalives on the connection, so that an Asterisk host that vanishes without
+        closing it surfaces as a broken pipe instead of leaving the handler blocked indefinitely,
+        and applies the server's `read_timeout`, if any.
+        """
+        self.timeout = self.server.read_timeout
+        socketserver.StreamRequestHandler.setup(self)
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle)
+            
     def handle(self):
         """
         Creates an instance of an AGI-interface object and passes it to a pre-specified callable,
@@ -99,44 +161,46 @@ class _AGIClientHandler(socketserver.StreamRequestHandler):
         """
         agi_instance = FastAGI(self.rfile, self.wfile, debug=self.server.debug)
 
-        (path, kwargs) = self._extract_query_elements(agi_instance)
-        args = self._extract_positional_args(agi_instance)
+        environment = agi_instance.get_environment()
+        (path, kwargs) = self._extract_query_elements(environment)
+        args = self._extract_positional_args(environment)
         
         (handler, match) = self.server.get_script_handler(path)
         if handler:
             handler(agi_instance, args, kwargs, match, path)
 
-    def _extract_positional_args(self, agi_instance):
+    def _extract_positional_args(self, env):
         """
-        Pulls the 'agi_arg_x' values out of the AGI instance to make them easier to process, since
-        the specification by which they're supplied may change in the future.
+        Pulls the 'agi_arg_x' values out of the AGI environment, `env`, to make them easier to
+        process, since the specification by which they're supplied may change in the future.
         """
-        env = agi_instance.get_environment()
         keys = sorted((int(key[8:]) for key in env if key.startswith('agi_arg_')))
         return tuple((env['agi_arg_%i' % key] for key in keys))
 
-    def _extract_query_elements(self, agi_instance):
+    def _extract_query_elements(self, env):
         """
         Provides the path string and a dictionary of keyword arguments passed along with the AGI
-        request. Arguments are supplied as a list, since the same parameter may be specified
-        multiple times.
+        request, as described by the AGI environment, `env`. Arguments are supplied as a list,
+        since the same parameter may be specified multiple times.
         """
-        tokens = (agi_instance.get_environment().get('agi_network_script') or '/').split('?', 1)
+        tokens = (env.get('agi_network_script') or '/').split('?', 1)
         path = tokens[0]
         if len(tokens) == 1:
             return (path, {})
-        return (path, cgi.urlparse.parse_qs(tokens[1]))
+        return (path, urllib.parse.parse_qs(tokens[1]))
 
 class FastAGIServer(_ThreadedTCPServer):
     """
     Provides a FastAGI TCP server to handle requests from Asterisk servers.
     """
     debug = False #Used to enable various printouts for library development
+    read_timeout = None #The number of seconds a connection may be silent before it is treated as hung up, or None to wait forever
     _default_script_handler = None #A script-handler to use if nothing else matched
     _script_handlers = None #A list of regex/callable pairs to use when determining how to handle an AGI request
     _script_handlers_lock = None #A lock used to prevent race conditions on the handlers list
     
-    def __init__(self, interface='127.0.0.1', port=4573, daemon_threads=True, debug=False):
+    def __init__(self, interface='127.0.0.1', port=4573, daemon_threads=True, debug=False, max_workers=None,
+                 reuse_port=False, read_timeout=None, queue_size=None):
         """
         Creates the server and binds the client-handler callable.
         
@@ -149,10 +213,41 @@ class FastAGIServer(_ThreadedTCPServer):
         idea to avoid hung calls keeping the process alive forever)
 
         `debug` should only be turned on for library development.
+
+        `max_workers`, if set, is the number of threads kept alive to handle
+        requests; calls are then served by reusable workers rather than a new
+        thread apiece, and any that arrive while all workers are busy wait until
+        one is free. `daemon_threads` does not apply to pooled workers.
+
+        `queue_size`, used only with `max_workers`, is the number of calls that
+        may wait for a free worker; further connections are closed as soon as
+        they are accepted, leaving Asterisk to continue the dialplan as though
+        the AGI had failed. If `None`, the number of waiting calls is unlimited.
+
+        `reuse_port`, if `True`, allows several processes, each with its own
+        `FastAGIServer`, to listen on the same port, with the kernel
+        distributing new connections between them, so that handlers can make
+        use of more than one CPU core; handler state is not shared between
+        processes. Requires a platform that supports SO_REUSEPORT, such as
+        Linux 3.9 or newer.
+
+        `read_timeout`, if set, is the number of seconds for which a connection
+        may block without Asterisk sending or accepting data before
+        `AGISIGPIPEHangup` is raised in its handler, freeing the thread. Since
+        Asterisk only responds once an action completes, this must exceed the
+        longest action issued, such as a file's playback or a recording.
         """
+        self.allow_reuse_port = reuse_port
+        self.read_timeout = read_timeout
         _ThreadedTCPServer.__init__(self, (interface, port), _AGIClientHandler)
         self.debug = debug
         self.daemon_threads = daemon_threads
+        if max_workers is not None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+             max_workers=max_workers, thread_name_prefix='FastAGI',
+            )
+            if queue_size is not None:
+                self._pool_slots = threading.BoundedSemaphore(max_workers + queue_size)
         self._script_handlers = []
         self._script_handlers_lock = threading.Lock()
 
@@ -233,10 +328,13 @@ class FastAGI(_AGI):
     """
     def __init__(self, rfile, wfile, debug=False):
         """
-        Associates I/O with `rfile` and `wfile`.
+        Associates I/O with `rfile` and `wfile`, which must be binary-mode file-like objects. If
+        `rfile` is unbuffered, it is wrapped in a buffered reader.
 
         `debug` should only be turned on for library development.
         """
+        if isinstance(rfile, io.RawIOBase): #Raw readline() would fetch one byte per read() call
+            rfile = io.BufferedReader(rfile)
         self._rfile = rfile
         self._wfile = wfile
         
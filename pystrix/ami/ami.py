@@ -34,6 +34,7 @@ Authors:
 """
 import abc
 import collections
+import logging
 import random
 import re
 import socket
@@ -70,6 +71,9 @@ KEY_ACTIONID = 'ActionID' #The key used to hold the ActionID of a request, for m
 KEY_EVENT = 'Event' #The key used to hold the event-name of a response
 KEY_RESPONSE = 'Response' #The key used to hold the event-name of a request
 
+_KEYS_RESERVED = frozenset((KEY_ACTION, KEY_ACTIONID)) #Request keys that are placed explicitly when building a request
+_TYPES_MULTI_VALUE = frozenset((tuple, list, set, frozenset)) #Value-types that are emitted as one header per element
+
 _CALLBACK_TYPE_REFERENCE = 1 #Identifies a callback-definition as an event-reference
 _CALLBACK_TYPE_UNIVERSAL = 2 #Identifies a callback-definition as universal
 _CALLBACK_TYPE_ORPHANED = 3 #Identifies a callback-definition for orphaned responses
@@ -82,14 +86,10 @@ def _format_socket_error(exception):
     @param str exception: The `socket.error` to be formatted.
     @return str: A nicely formatted summary of the exception.
     """
-    try:
-        (errno, message) = exception
-        return "[%(errno)i] %(error)s" % {
-         'errno': errno,
-         'error': message,
-        }
-    except Exception:
+    errno = getattr(exception, 'errno', None)
+    if errno is None:
         return str(exception)
+    return "[%i] %s" % (errno, exception.strerror or exception)
         
 class Manager(object):
     _alive = True #False when this manager object is ready to be disposed of
@@ -110,6 +110,9 @@ class Manager(object):
     _orphaned_response_timeout = None #The number of seconds to hold on to request-responses before considering them to be timed-out
     _outstanding_requests = None #A dictionary of ActionIDs sent to Asterisk, currently awaiting responses; values are a tuple of (events, pending_finalisers), if synchronous, and None otherwise
     _logger = None #A logger that may be used to record warnings
+    _log_debug = None #The callable used to emit debug messages; the logger's bound method or `warnings.warn`
+    _log_error = None #The callable used to emit error messages; the logger's bound method or `warnings.warn`
+    _log_warning = None #The callable used to emit warnings; the logger's bound method or `warnings.warn`
     
     def __init__(self, debug=False, logger=None, aggregate_timeout=5, orphaned_response_timeout=5):
         """
@@ -132,6 +135,12 @@ class Manager(object):
         """
         self._debug = debug
         self._logger = logger
+        if logger:
+            self._log_debug = logger.debug
+            self._log_error = logger.error
+            self._log_warning = logger.warning
+        else:
+            self._log_debug = self._log_error = self._log_warning = warnings.warn
         
         self._action_id = 0
         action_id_random_token = []
@@ -198,7 +207,7 @@ class Manager(object):
                         for (i, aggregate) in enumerate(self._event_aggregates):
                             if aggregate[0] <= current_time: #Expired
                                 del self._event_aggregates[i]
-                                (self._logger and self._logger.warn or warnings.warn)("Aggregate '%(name)s' for action-ID '%(action-id)s' timed out before all events were gathered" % {
+                                self._log_warning("Aggregate '%(name)s' for action-ID '%(action-id)s' timed out before all events were gathered" % {
                                  'name': aggregate[1].name,
                                  'action-id': aggregate[1].action_id,
                                 })
@@ -245,8 +254,8 @@ class Manager(object):
             with self._event_callbacks_lock:
                 callbacks = [c for (t, e, c) in self._event_callbacks if (t == _CALLBACK_TYPE_REFERENCE and event_name == e) or (t == _CALLBACK_TYPE_UNIVERSAL)]
                 
-            if self._logger:
-                self._logger.debug("Received event '%(name)s' with %(callbacks)i callbacks" % {
+            if self._logger and self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Received event '%(name)s' with %(callbacks)i callbacks", {
                  'name': event_name,
                  'callbacks': len(callbacks),
                 })
@@ -255,7 +264,7 @@ class Manager(object):
                 try:
                     callback(event, self)
                 except Exception as e:
-                    (self._logger and self._logger.error or warnings.warn)("Exception occurred while processing event callback: event='%(event)r'; handler='%(function)s' exception: %(error)s; trace:\n%(trace)s" % {
+                    self._log_error("Exception occurred while processing event callback: event='%(event)r'; handler='%(function)s' exception: %(error)s; trace:\n%(trace)s" % {
                      'event': event,
                      'function': str(callback),
                      'error': str(e),
@@ -282,8 +291,8 @@ class Manager(object):
             with self._event_callbacks_lock:
                 callbacks = [c for (t, e, c) in self._event_callbacks if t == _CALLBACK_TYPE_ORPHANED]
                 
-            if self._logger:
-                self._logger.debug("Received orphaned response '%(name)s' with %(callbacks)i callbacks" % {
+            if self._logger and self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Received orphaned response '%(name)s' with %(callbacks)i callbacks", {
                  'name': response.name,
                  'callbacks': len(callbacks),
                 })
@@ -292,7 +301,7 @@ class Manager(object):
                 try:
                     callback(response, self)
                 except Exception as e:
-                    (self._logger and self._logger.error or warnings.warn)("Exception occurred while processing orphaned response handler: response=%(response)r; handler='%(function)s'; exception: %(error)s; trace:\n%(trace)s" % {
+                    self._log_error("Exception occurred while processing orphaned response handler: response=%(response)r; handler='%(function)s'; exception: %(error)s; trace:\n%(trace)s" % {
                      'response': response,
                      'function': str(callback),
                      'error': str(e),
@@ -524,7 +533,7 @@ class Manager(object):
                 for aggregate_class in request.get_aggregate_classes():
                     self._event_aggregates.append((time.time() + self._event_aggregates_timeout, aggregate_class(action_id)))
                     if self._debug:
-                        (self._logger and self._logger.debug or warnings.warn)("Started building aggregate-event '%(event)s' for action-ID '%(action-id)s'" % {
+                        self._log_debug("Started building aggregate-event '%(event)s' for action-ID '%(action-id)s'" % {
                          'event': _EVENT_REGISTRY_REV.get(aggregate_class),
                          'action-id': action_id,
                         })
@@ -553,7 +562,7 @@ class Manager(object):
         else: #Timed out
             if request.synchronous:
                 events_timeout = True
-                (self._logger and self._logger.warn or warnings.warn)("Timed out while collecting events for synchronised action-ID '%(action-id)s'" % {
+                self._log_warning("Timed out while collecting events for synchronised action-ID '%(action-id)s'" % {
                  'action-id': action_id,
                 })
                 
@@ -570,7 +579,7 @@ class Manager(object):
                 events_timeout
             )
         else:
-            (self._logger and self._logger.warn or warnings.warn)("Timed out while waiting for response for action-ID '%(action-id)s'" % {
+            self._log_warning("Timed out while waiting for response for action-ID '%(action-id)s'" % {
              'action-id': action_id,
             })
             return None
@@ -907,9 +916,9 @@ class _Request(dict):
         The 'Action' line is always first.
         """
         items = [(KEY_ACTION, self[KEY_ACTION])]
-        for (key, value) in [(k, v) for (k, v) in self.items() if not k in (KEY_ACTION, KEY_ACTIONID)] + list(kwargs.items()):
+        for (key, value) in [(k, v) for (k, v) in self.items() if not k in _KEYS_RESERVED] + list(kwargs.items()):
             key = str(key)
-            if type(value) in (tuple, list, set, frozenset):
+            if type(value) in _TYPES_MULTI_VALUE:
                 for val in value:
                     items.append((key, str(val)))
             else:
@@ -1032,7 +1041,7 @@ class _MessageReader(threading.Thread):
                     else:
                         message.__class__ = _Event
                         if self._manager._debug:
-                            (self._manager._logger and self._manager._logger.warn or warnings.warn)("Unknown event received: " + repr(message))
+                            self._manager._log_warning("Unknown event received: " + repr(message))
                             
                     self.event_queue.put(message)
                 elif action_id is not None:
@@ -56,7 +56,7 @@ class MeetmeList(_Request):
         `conference` is the optional identifier of the bridge.
         """
         _Request.__init__(self, 'MeetmeList')
-        if not conference is None:
+        if conference is not None:
             self['Conference'] = conference
             
 class MeetmeListRooms(_Request):
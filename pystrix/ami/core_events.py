@@ -932,7 +932,8 @@ class QueueStatus_Aggregate(_Aggregate):
     """
     _name = "QueueStatus_Aggregate"
     
-    _aggregation_members = (QueueParams, QueueMember, QueueEntry,)
+    #Ordered by expected frequency, since membership is tested linearly for every event received
+    _aggregation_members = (QueueMember, QueueEntry, QueueParams,)
     _aggregation_finalisers = (QueueStatusComplete,)
 
 
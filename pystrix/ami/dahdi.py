@@ -100,6 +100,6 @@ class DAHDIShowChannels(_Request):
     
     def __init__(self, dahdi_channel=None):
         _Request.__init__(self, 'DAHDIShowChannels')
-        if not dahdi_channel is None:
+        if dahdi_channel is not None:
             self['DAHDIChannel'] = dahdi_channel
             